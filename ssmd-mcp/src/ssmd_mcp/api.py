@@ -1,20 +1,124 @@
 """ssmd-data-ts API client."""
 
+import asyncio
+import atexit
 import logging
-from typing import Any
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+from urllib.request import getproxies, proxy_bypass_environment
 
 import httpx
+import orjson
 
 from ssmd_mcp.config import Config
 
 logger = logging.getLogger(__name__)
 
-# In-memory market cache for session
-_market_cache: dict[str, dict[str, Any]] = {}
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
-def _get_client(cfg: Config) -> httpx.Client:
-    """Create an httpx client for ssmd-data-ts."""
+class _TTLCache:
+    """Bounded LRU cache whose entries expire ttl seconds after insertion."""
+
+    def __init__(self, capacity: int = 4096, ttl: float = 300.0) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expiry, value = entry
+            if time.monotonic() >= expiry:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def resize(self, capacity: int, ttl: float) -> None:
+        """Change capacity and default TTL, evicting LRU entries down to capacity."""
+        with self._lock:
+            self.capacity = capacity
+            self.ttl = ttl
+            while len(self._data) > capacity:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# In-memory market cache for session; bounded so long sessions don't grow
+# without limit, and entries expire so market status/close times stay fresh
+_market_cache = _TTLCache(capacity=4096, ttl=300.0)
+
+# Max IDs per /v1/markets/lookup request (keeps URLs under proxy limits)
+LOOKUP_CHUNK_SIZE = 100
+
+# One pool shared by every tool that fans a call out into parallel requests,
+# so nested fan-out stays bounded however many tool calls are in flight.
+# Its tasks must not submit to it themselves.
+FANOUT_WORKERS = 8
+_fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="ssmd-fanout")
+
+# Short-lived cache of GET responses for slow-changing endpoints (see cached_get)
+_response_cache = _TTLCache(capacity=256, ttl=30.0)
+
+
+def configure_caches(cfg: Config) -> None:
+    """Apply the configured market cache size and TTL (SSMD_MARKET_CACHE_*)."""
+    _market_cache.resize(cfg.market_cache_size, cfg.market_cache_ttl)
+
+
+def fanout(fn: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+    """Map fn over items on the shared fan-out pool, preserving order."""
+    return list(_fanout_pool.map(fn, items))
+
+
+# Pooled clients for session, keyed by (frozen, hashable) config
+_clients: dict[Config, httpx.Client] = {}
+_clients_lock = threading.Lock()
+_async_clients: dict[Config, httpx.AsyncClient] = {}
+# httpx drops idle connections after 5s by default, shorter than the usual gap
+# between an agent's tool calls; keep them for a minute so calls reuse them
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0)
+
+# Connection failures are retried by the transport; throttled (429) and
+# transient gateway responses are retried here with backoff, honoring
+# Retry-After, so a flaky upstream doesn't fail the whole tool call
+CONNECT_RETRIES = 3
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 10.0
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _client_headers(cfg: Config) -> dict[str, str]:
     headers = {
         "User-Agent": "ssmd-mcp/0.1.0",
         "X-Client-Type": "mcp",
@@ -24,97 +128,409 @@ def _get_client(cfg: Config) -> httpx.Client:
     if cfg.cf_client_id and cfg.cf_client_secret:
         headers["CF-Access-Client-Id"] = cfg.cf_client_id
         headers["CF-Access-Client-Secret"] = cfg.cf_client_secret
-    return httpx.Client(
-        base_url=cfg.api_url,
-        headers=headers,
-        timeout=30.0,
-    )
+    return headers
 
 
-def api_get(cfg: Config, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-    """Generic GET request to ssmd-data-ts API."""
+def _proxy_urls(cfg: Config) -> dict[str, str]:
+    """Proxy URL per mount pattern from HTTP(S)_PROXY/ALL_PROXY.
+
+    Clients get an explicit transport (for HTTP/2, limits and retries), which
+    makes httpx skip its own proxy environment handling, so it is redone here.
+    Empty when NO_PROXY covers the API host.
+    """
+    host = httpx.URL(cfg.api_url).host
+    if not host or proxy_bypass_environment(host):
+        return {}
+    proxies = getproxies()
+    return {
+        f"{scheme}://": url if "://" in url else f"http://{url}"
+        for scheme in ("http", "https", "all")
+        if (url := proxies.get(scheme))
+    }
+
+
+def _get_client(cfg: Config) -> httpx.Client:
+    """Get the shared httpx client for ssmd-data-ts, creating it on first use.
+
+    The client is kept open for the session so keep-alive connections are
+    reused across tool calls instead of paying a TCP+TLS handshake per request.
+    """
+    client = _clients.get(cfg)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(cfg)
+            if client is None:
+                client = httpx.Client(
+                    base_url=cfg.api_url,
+                    headers=_client_headers(cfg),
+                    timeout=30.0,
+                    transport=httpx.HTTPTransport(http2=True, limits=_LIMITS, retries=CONNECT_RETRIES),
+                    mounts={
+                        pattern: httpx.HTTPTransport(
+                            proxy=url, http2=True, limits=_LIMITS, retries=CONNECT_RETRIES
+                        )
+                        for pattern, url in _proxy_urls(cfg).items()
+                    },
+                )
+                _clients[cfg] = client
+    return client
+
+
+def _get_async_client(cfg: Config) -> httpx.AsyncClient:
+    """Get the shared async httpx client for ssmd-data-ts, creating it on first use.
+
+    Only used from the server's event loop, so no locking is needed.
+    """
+    client = _async_clients.get(cfg)
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=cfg.api_url,
+            headers=_client_headers(cfg),
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=_LIMITS, retries=CONNECT_RETRIES),
+            mounts={
+                pattern: httpx.AsyncHTTPTransport(
+                    proxy=url, http2=True, limits=_LIMITS, retries=CONNECT_RETRIES
+                )
+                for pattern, url in _proxy_urls(cfg).items()
+            },
+        )
+        _async_clients[cfg] = client
+    return client
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float | None:
+    """Seconds to wait before retrying resp, or None if it should not be retried."""
+    if resp.status_code not in _RETRY_STATUSES or attempt >= MAX_RETRIES:
+        return None
+    try:
+        delay = float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        delay = 0.5 * 2**attempt + random.uniform(0, 0.25)
+    return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+
+def _get(client: httpx.Client, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
+    """GET with retry on throttled/transient responses."""
+    attempt = 0
+    while True:
+        resp = client.get(path, params=params)
+        delay = _retry_delay(resp, attempt)
+        if delay is None:
+            return resp
+        logger.warning("API GET %s returned %d, retrying in %.1fs", path, resp.status_code, delay)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def _aget(client: httpx.AsyncClient, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
+    """Async GET with retry on throttled/transient responses."""
+    attempt = 0
+    while True:
+        resp = await client.get(path, params=params)
+        delay = _retry_delay(resp, attempt)
+        if delay is None:
+            return resp
+        logger.warning("API GET %s returned %d, retrying in %.1fs", path, resp.status_code, delay)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def close_clients() -> None:
+    """Close all pooled sync clients."""
+    with _clients_lock:
+        while _clients:
+            _, client = _clients.popitem()
+            client.close()
+
+
+async def aclose_clients() -> None:
+    """Close all pooled async clients."""
+    while _async_clients:
+        _, client = _async_clients.popitem()
+        await client.aclose()
+
+
+atexit.register(close_clients)
+
+
+_NOT_CONFIGURED = "SSMD_API_URL not configured"
+# Serialized once: api_get_text returns it as-is when no API URL is set
+_NOT_CONFIGURED_TEXT = orjson.dumps({"error": _NOT_CONFIGURED}).decode()
+
+# Transport failures map to fixed messages by exception class rather than
+# str(exc), which is slow to format and leaks hosts and socket details
+_REQUEST_FAILED = "API request failed"
+_TRANSPORT_ERRORS: dict[type[httpx.HTTPError], str] = {
+    httpx.ConnectError: "API request failed: connection error",
+    httpx.TimeoutException: "API request failed: timeout",
+}
+# Pre-serialized bodies for api_get_text, keyed by message
+_ERROR_TEXT = {
+    msg: orjson.dumps({"error": msg}).decode()
+    for msg in (_REQUEST_FAILED, *_TRANSPORT_ERRORS.values())
+}
+
+
+def _transport_error(exc: httpx.HTTPError) -> str:
+    """Fixed error message for a transport failure, by its nearest mapped class."""
+    for cls in type(exc).__mro__:
+        msg = _TRANSPORT_ERRORS.get(cls)
+        if msg is not None:
+            return msg
+    return _REQUEST_FAILED
+
+
+def _api_response(cfg: Config, path: str, params: dict[str, Any] | None = None) -> httpx.Response | dict[str, Any]:
+    """GET path, returning the successful response or an {"error": ...} dict."""
     if not cfg.api_url:
-        return {"error": "SSMD_API_URL not configured"}
+        return {"error": _NOT_CONFIGURED}
     try:
-        with _get_client(cfg) as client:
-            resp = client.get(path, params=params)
-            resp.raise_for_status()
-            return resp.json()
+        resp = _get(_get_client(cfg), path, params)
+        resp.raise_for_status()
+        return resp
     except httpx.HTTPStatusError as e:
         logger.error("API GET %s returned %d: %s", path, e.response.status_code, e.response.text[:200])
         return {"error": f"API returned {e.response.status_code}: {e.response.text[:200]}"}
     except httpx.HTTPError as e:
         logger.error("API GET %s failed: %s", path, e)
-        return {"error": f"API request failed: {e}"}
+        return {"error": _transport_error(e)}
+
+
+def api_get(cfg: Config, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Generic GET request to ssmd-data-ts API."""
+    resp = _api_response(cfg, path, params)
+    return resp if isinstance(resp, dict) else orjson.loads(resp.content)
+
+
+def api_get_text(cfg: Config, path: str, params: dict[str, Any] | None = None) -> str:
+    """GET returning the upstream JSON body as-is.
+
+    For tools that pass the response through unchanged, skipping the
+    decode/re-encode round trip. Errors are rendered as the same
+    {"error": ...} object api_get returns.
+    """
+    if not cfg.api_url:
+        return _NOT_CONFIGURED_TEXT
+    resp = _api_response(cfg, path, params)
+    if isinstance(resp, dict):
+        return _ERROR_TEXT.get(resp["error"]) or orjson.dumps(resp).decode()
+    return resp.text
+
+
+def cached_get(
+    cfg: Config,
+    path: str,
+    params: dict[str, Any] | None = None,
+    ttl: float | None = None,
+) -> dict[str, Any]:
+    """GET via api_get, reusing a successful response for ttl seconds.
+
+    For endpoints whose data changes on a minute-or-slower scale, so repeated
+    tool calls in a session don't each pay an upstream round trip. Errors are
+    never cached.
+    """
+    key = (cfg, path, tuple(sorted(params.items())) if params else ())
+    result = _response_cache.get(key)
+    if result is None:
+        result = api_get(cfg, path, params)
+        if "error" not in result:
+            _response_cache.put(key, result, ttl)
+    return result
 
 
 def api_post(cfg: Config, path: str, json_body: dict[str, Any] | None = None) -> dict[str, Any]:
     """Generic POST request to ssmd-data-ts API."""
     if not cfg.api_url:
-        return {"error": "SSMD_API_URL not configured"}
+        return {"error": _NOT_CONFIGURED}
     try:
-        with _get_client(cfg) as client:
-            resp = client.post(path, json=json_body)
-            resp.raise_for_status()
-            return resp.json()
+        resp = _get_client(cfg).post(path, json=json_body)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
     except httpx.HTTPStatusError as e:
         logger.error("API POST %s returned %d: %s", path, e.response.status_code, e.response.text[:200])
         return {"error": f"API returned {e.response.status_code}: {e.response.text[:200]}"}
     except httpx.HTTPError as e:
         logger.error("API POST %s failed: %s", path, e)
-        return {"error": f"API request failed: {e}"}
+        return {"error": _transport_error(e)}
+
+
+# Market lookups in flight on the event loop, by cache key
+_inflight_markets: dict[tuple[str, str], asyncio.Future[dict[str, Any] | None]] = {}
+
+
+def _market_key(mid: str, feed: str | None) -> tuple[str, str]:
+    """Market cache key; padding is ignored but case is kept, as upstream IDs match exactly."""
+    return (feed or "").lower(), mid.strip()
+
+
+def _split_cached(ids: list[str], feed: str | None) -> tuple[list[dict[str, Any]], list[str]]:
+    """Split IDs into cached market results and IDs that still need a lookup.
+
+    IDs are stripped, and duplicates by cache key are dropped (first
+    occurrence wins) so each market is requested and returned once.
+    """
+    results = []
+    uncached_ids = []
+    seen = set()
+    for mid in ids:
+        key = _market_key(mid, feed)
+        if key in seen:
+            continue
+        seen.add(key)
+        cached = _market_cache.get(key)
+        if cached is not None:
+            results.append(cached)
+        else:
+            uncached_ids.append(mid.strip())
+    return results, uncached_ids
+
+
+def _lookup_params(uncached_ids: list[str], feed: str | None) -> dict[str, Any]:
+    params: dict[str, Any] = {"ids": ",".join(uncached_ids)}
+    if feed:
+        params["feed"] = feed
+    return params
+
+
+def _cache_markets(data: Any, feed: str | None) -> list[dict[str, Any]]:
+    """Cache markets from a lookup response and return them."""
+    markets = data if isinstance(data, list) else data.get("markets", [])
+    for m in markets:
+        _market_cache.put(_market_key(_market_id(m), feed), m)
+    return markets
+
+
+def _market_id(market: dict[str, Any]) -> str:
+    # Markets are keyed by whichever ID field the feed uses
+    return market.get("id") or market.get("market_ticker") or market.get("product_id", "")
+
+
+def _in_request_order(markets: list[dict[str, Any]], ids: list[str], feed: str | None) -> list[dict[str, Any]]:
+    """Order markets as their IDs were requested.
+
+    Rows that match no requested ID (errors, or markets returned under a
+    different ID field) keep their relative order at the end.
+    """
+    rank: dict[tuple[str, str], int] = {}
+    for mid in ids:
+        rank.setdefault(_market_key(mid, feed), len(rank))
+    last = len(rank)
+    return sorted(markets, key=lambda m: rank.get(_market_key(_market_id(m), feed), last))
+
+
+def _chunk_ids(ids: list[str]) -> list[list[str]]:
+    return [ids[i:i + LOOKUP_CHUNK_SIZE] for i in range(0, len(ids), LOOKUP_CHUNK_SIZE)]
+
+
+def _fetch_markets(cfg: Config, ids: list[str], feed: str | None) -> list[dict[str, Any]]:
+    try:
+        resp = _get(_get_client(cfg), "/v1/markets/lookup", _lookup_params(ids, feed))
+        resp.raise_for_status()
+        return _cache_markets(orjson.loads(resp.content), feed)
+    except httpx.HTTPError as e:
+        logger.error("Market lookup failed: %s", e)
+        return [{"error": _transport_error(e)}]
+
+
+async def _afetch_markets(cfg: Config, ids: list[str], feed: str | None) -> list[dict[str, Any]]:
+    try:
+        resp = await _aget(_get_async_client(cfg), "/v1/markets/lookup", _lookup_params(ids, feed))
+        resp.raise_for_status()
+        return _cache_markets(orjson.loads(resp.content), feed)
+    except httpx.HTTPError as e:
+        logger.error("Market lookup failed: %s", e)
+        return [{"error": _transport_error(e)}]
 
 
 def lookup_markets(cfg: Config, ids: list[str], feed: str | None = None) -> list[dict[str, Any]]:
     """Look up markets by ID via ssmd-data-ts GET /v1/markets.
 
-    Results are cached in-memory for the session.
+    Results are cached in-memory for the session. Uncached IDs are fetched
+    in chunks of LOOKUP_CHUNK_SIZE to keep URLs short, concurrently when
+    there is more than one chunk. Markets are returned in request order.
     """
     if not cfg.api_url:
-        return [{"error": "SSMD_API_URL not configured"}]
+        return [{"error": _NOT_CONFIGURED}]
 
-    results = []
-    uncached_ids = []
+    results, uncached_ids = _split_cached(ids, feed)
+    chunks = _chunk_ids(uncached_ids)
 
-    for mid in ids:
-        cache_key = f"{feed or ''}:{mid}"
-        if cache_key in _market_cache:
-            results.append(_market_cache[cache_key])
-        else:
-            uncached_ids.append(mid)
-
-    if uncached_ids:
-        try:
-            with _get_client(cfg) as client:
-                params: dict[str, Any] = {"ids": ",".join(uncached_ids)}
-                if feed:
-                    params["feed"] = feed
-                resp = client.get("/v1/markets/lookup", params=params)
-                resp.raise_for_status()
-                data = resp.json()
-                markets = data if isinstance(data, list) else data.get("markets", [])
-                for m in markets:
-                    # Cache by various ID fields
-                    mid = m.get("id") or m.get("market_ticker") or m.get("product_id", "")
-                    cache_key = f"{feed or ''}:{mid}"
-                    _market_cache[cache_key] = m
-                    results.append(m)
-        except httpx.HTTPError as e:
-            logger.error("Market lookup failed: %s", e)
-            results.append({"error": "API request failed"})
+    if len(chunks) == 1:
+        results.extend(_fetch_markets(cfg, chunks[0], feed))
+    elif chunks:
+        for markets in fanout(lambda chunk: _fetch_markets(cfg, chunk, feed), chunks):
+            results.extend(markets)
 
+    return _in_request_order(results, ids, feed)
+
+
+async def _afetch_chunks(cfg: Config, ids: list[str], feed: str | None) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for markets in await asyncio.gather(*(_afetch_markets(cfg, chunk, feed) for chunk in _chunk_ids(ids))):
+        results.extend(markets)
     return results
 
 
+async def lookup_markets_async(cfg: Config, ids: list[str], feed: str | None = None) -> list[dict[str, Any]]:
+    """Async variant of lookup_markets on the shared async client.
+
+    Lets concurrent lookup_market tool calls overlap their network latency
+    on the event loop instead of queueing for worker threads. A market
+    already being fetched by another call is awaited rather than requested
+    again; if that fetch didn't yield it, it is requested here.
+    """
+    if not cfg.api_url:
+        return [{"error": _NOT_CONFIGURED}]
+
+    results, uncached_ids = _split_cached(ids, feed)
+
+    owned: dict[str, asyncio.Future[dict[str, Any] | None]] = {}
+    waiting: list[tuple[str, asyncio.Future[dict[str, Any] | None]]] = []
+    loop = asyncio.get_running_loop()
+    for mid in uncached_ids:
+        key = _market_key(mid, feed)
+        future = _inflight_markets.get(key)
+        if future is None:
+            owned[mid] = _inflight_markets[key] = loop.create_future()
+        else:
+            waiting.append((mid, future))
+
+    fetched: list[dict[str, Any]] = []
+    try:
+        fetched = await _afetch_chunks(cfg, list(owned), feed)
+        results.extend(fetched)
+    finally:
+        # Resolved from the fetched rows, not the cache, which may not hold
+        # them (size 0, TTL 0, or evicted by a large lookup)
+        by_key = {_market_key(_market_id(m), feed): m for m in fetched}
+        for mid, future in owned.items():
+            key = _market_key(mid, feed)
+            del _inflight_markets[key]
+            if not future.done():
+                future.set_result(by_key.get(key))
+
+    missing = []
+    for mid, future in waiting:
+        # Shielded so cancelling this call doesn't cancel the owner's future
+        market = await asyncio.shield(future)
+        if market is None:
+            missing.append(mid)
+        else:
+            results.append(market)
+    results.extend(await _afetch_chunks(cfg, missing, feed))
+
+    return _in_request_order(results, ids, feed)
+
+
 def get_catalog(cfg: Config) -> dict[str, Any]:
     """Get feed catalog from ssmd-data-ts."""
     if not cfg.api_url:
-        return {"error": "SSMD_API_URL not configured"}
+        return {"error": _NOT_CONFIGURED}
     try:
-        with _get_client(cfg) as client:
-            resp = client.get("/v1/catalog")
-            resp.raise_for_status()
-            return resp.json()
+        resp = _get(_get_client(cfg), "/v1/catalog")
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
     except httpx.HTTPError as e:
         logger.error("Catalog request failed: %s", e)
-        return {"error": "API request failed"}
+        return {"error": _transport_error(e)}
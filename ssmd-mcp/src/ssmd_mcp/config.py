@@ -6,19 +6,26 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Config:
     api_url: str = ""
     api_key: str = ""
     cf_client_id: str = ""
     cf_client_secret: str = ""
+    market_cache_size: int = 4096
+    market_cache_ttl: float = 300.0
 
 
 def load_config() -> Config:
     load_dotenv()
+    market_cache_size = int(os.getenv("SSMD_MARKET_CACHE_SIZE", "4096"))
+    if market_cache_size < 0:
+        raise ValueError(f"SSMD_MARKET_CACHE_SIZE must be >= 0, got {market_cache_size}")
     return Config(
         api_url=os.getenv("SSMD_API_URL", ""),
         api_key=os.getenv("SSMD_API_KEY", ""),
         cf_client_id=os.getenv("SSMD_CF_CLIENT_ID", ""),
         cf_client_secret=os.getenv("SSMD_CF_CLIENT_SECRET", ""),
+        market_cache_size=market_cache_size,
+        market_cache_ttl=float(os.getenv("SSMD_MARKET_CACHE_TTL", "300")),
     )
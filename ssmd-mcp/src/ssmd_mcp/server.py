@@ -1,19 +1,27 @@
 """ssmd-mcp: MCP server for querying ssmd market data."""
 
 import asyncio
-import json
 import logging
+import logging.handlers
+import queue
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+from ssmd_mcp.api import aclose_clients, configure_caches
 from ssmd_mcp.config import load_config, Config
 from ssmd_mcp.tools import (
+    dumps,
     query_trades,
     query_prices,
     query_snap,
-    lookup_market,
+    lookup_market_async,
     list_feeds,
     check_freshness,
     query_events,
@@ -21,6 +29,7 @@ from ssmd_mcp.tools import (
     browse_categories,
     browse_series,
     browse_events,
+    browse_tree,
     browse_markets,
     secmaster_stats,
     search_markets,
@@ -43,10 +52,15 @@ from ssmd_mcp.tools import (
     get_pipeline_run_details,
 )
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-TOOLS = [
+# Worker threads for blocking (sync HTTP) tool handlers
+TOOL_WORKERS = 8
+# Cap on tool calls in flight at once (sync and async). Tools that fan out
+# into parallel requests share api.FANOUT_WORKERS threads on top of this
+TOOL_CONCURRENCY = 16
+
+TOOLS: tuple[Tool, ...] = (
     Tool(
         name="query_trades",
         description=(
@@ -72,6 +86,11 @@ TOOLS = [
                     "description": "Max number of tickers to return. Default 20.",
                     "default": 20,
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return these fields per row (e.g., ['ticker', 'trade_count', 'total_volume']). Omit for all fields.",
+                },
             },
             "required": ["feed"],
         },
@@ -100,6 +119,11 @@ TOOLS = [
                     "type": "string",
                     "description": "Hour in HHMM format (e.g., '1400'). Defaults to most recent.",
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return these fields per row (e.g., ['ticker', 'yes_bid', 'yes_ask']). Omit for all fields.",
+                },
             },
             "required": ["feed"],
         },
@@ -125,6 +149,11 @@ TOOLS = [
                     "type": "string",
                     "description": "Comma-separated ticker symbols. Omit to scan all.",
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return these fields per row (e.g., ['_ticker', 'yes_bid', 'last_price']). Omit for all fields.",
+                },
             },
             "required": ["feed"],
         },
@@ -283,6 +312,32 @@ TOOLS = [
             "required": ["series"],
         },
     ),
+    Tool(
+        name="browse_tree",
+        description=(
+            "Browse a category's series and, with depth 2, every series' events in one call. "
+            "Prefer this over chaining browse_series and browse_events when drilling "
+            "more than one level. At depth 2 only the first 50 series are expanded; "
+            "larger categories are marked truncated with totalSeries. "
+            "Hierarchy: categories → series → events → markets."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "category": {
+                    "type": "string",
+                    "description": "Category to browse (e.g., 'Crypto', 'Economics').",
+                },
+                "depth": {
+                    "type": "integer",
+                    "enum": [1, 2],
+                    "description": "1 = series only, 2 = series with their events. Default 1.",
+                    "default": 1,
+                },
+            },
+            "required": ["category"],
+        },
+    ),
     Tool(
         name="browse_markets",
         description=(
@@ -364,6 +419,11 @@ TOOLS = [
                     "description": "Max results to return. Default 100, max 500.",
                     "default": 100,
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return these fields per row (e.g., ['ticker', 'title', 'closeTime']). Omit for all fields.",
+                },
             },
         },
     ),
@@ -499,6 +559,11 @@ TOOLS = [
                     "description": "Max results to return. Default 100, max 500.",
                     "default": 100,
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Only return these fields per row (e.g., ['id', 'status', 'updatedAt']). Omit for all fields.",
+                },
             },
         },
     ),
@@ -832,228 +897,321 @@ TOOLS = [
             },
         },
     ),
-]
+)
+
+# list_tools response, built once: the tool set is fixed for the process
+_TOOL_LIST: list[Tool] = list(TOOLS)
+
+
+# Input validators compiled once per tool, instead of the SDK's per-call
+# jsonschema.validate() (which re-checks the schema itself every time)
+_VALIDATORS: dict[str, Draft202012Validator] = {
+    tool.name: Draft202012Validator(tool.inputSchema) for tool in TOOLS
+}
+
+
+def _validate_arguments(name: str, arguments: dict) -> None:
+    """Raise ValueError if arguments don't match the tool's inputSchema."""
+    validator = _VALIDATORS.get(name)
+    if validator is not None:
+        error = best_match(validator.iter_errors(arguments))
+        if error is not None:
+            raise ValueError(f"Input validation error: {error.message}")
+
+
+# Tool name -> handler taking (cfg, arguments); one hash lookup per call
+_TOOL_DISPATCH: dict[str, Callable[[Config, dict], str]] = {
+    "query_trades": lambda cfg, a: query_trades(
+        cfg,
+        feed=a["feed"],
+        date_str=a.get("date"),
+        limit=a.get("limit", 20),
+        fields=a.get("fields"),
+    ),
+    "query_prices": lambda cfg, a: query_prices(
+        cfg,
+        feed=a["feed"],
+        date_str=a.get("date"),
+        hour=a.get("hour"),
+        fields=a.get("fields"),
+    ),
+    "query_snap": lambda cfg, a: query_snap(
+        cfg,
+        feed=a["feed"],
+        tickers=a.get("tickers"),
+        fields=a.get("fields"),
+    ),
+    "list_feeds": lambda cfg, a: list_feeds(cfg),
+    "check_freshness": lambda cfg, a: check_freshness(
+        cfg,
+        feed=a.get("feed"),
+    ),
+    "query_events": lambda cfg, a: query_events(
+        cfg,
+        feed=a["feed"],
+        date_str=a.get("date"),
+        limit=a.get("limit", 20),
+    ),
+    "query_volume": lambda cfg, a: query_volume(
+        cfg,
+        date_str=a.get("date"),
+        feed=a.get("feed"),
+    ),
+    "browse_categories": lambda cfg, a: browse_categories(cfg),
+    "browse_series": lambda cfg, a: browse_series(cfg, category=a["category"]),
+    "browse_events": lambda cfg, a: browse_events(cfg, series=a["series"]),
+    "browse_tree": lambda cfg, a: browse_tree(
+        cfg,
+        category=a["category"],
+        depth=a.get("depth", 1),
+    ),
+    "browse_markets": lambda cfg, a: browse_markets(cfg, event=a["event"]),
+    "secmaster_stats": lambda cfg, a: secmaster_stats(cfg),
+    "search_markets": lambda cfg, a: search_markets(
+        cfg,
+        category=a.get("category"),
+        series=a.get("series"),
+        status=a.get("status"),
+        event=a.get("event"),
+        close_within_hours=a.get("close_within_hours"),
+        closing_after=a.get("closing_after"),
+        as_of=a.get("as_of"),
+        games_only=a.get("games_only"),
+        limit=a.get("limit"),
+        fields=a.get("fields"),
+    ),
+    "search_events": lambda cfg, a: search_events(
+        cfg,
+        category=a.get("category"),
+        series=a.get("series"),
+        status=a.get("status"),
+        as_of=a.get("as_of"),
+        limit=a.get("limit"),
+    ),
+    "search_pairs": lambda cfg, a: search_pairs(
+        cfg,
+        exchange=a.get("exchange"),
+        base=a.get("base"),
+        quote=a.get("quote"),
+        market_type=a.get("market_type"),
+        status=a.get("status"),
+        limit=a.get("limit"),
+    ),
+    "search_conditions": lambda cfg, a: search_conditions(
+        cfg,
+        category=a.get("category"),
+        status=a.get("status"),
+        limit=a.get("limit"),
+    ),
+    "search_lifecycle": lambda cfg, a: search_lifecycle(
+        cfg,
+        status=a.get("status"),
+        since=a.get("since"),
+        feed=a.get("feed"),
+        limit=a.get("limit"),
+        fields=a.get("fields"),
+    ),
+    "get_fees": lambda cfg, a: get_fees(
+        cfg,
+        series=a.get("series"),
+        as_of=a.get("as_of"),
+        limit=a.get("limit"),
+    ),
+    "list_api_keys": lambda cfg, a: list_api_keys(
+        cfg,
+        include_revoked=a.get("include_revoked", False),
+    ),
+    "query_key_usage": lambda cfg, a: query_key_usage(
+        cfg,
+        key_prefix=a.get("key_prefix"),
+    ),
+    "harman_sessions": lambda cfg, a: harman_sessions(cfg),
+    "harman_orders": lambda cfg, a: harman_orders(
+        cfg,
+        session_id=a["session_id"],
+        state=a.get("state"),
+        ticker=a.get("ticker"),
+        since=a.get("since"),
+        limit=a.get("limit", 100),
+        instance=a.get("instance"),
+    ),
+    "harman_fills": lambda cfg, a: harman_fills(
+        cfg,
+        session_id=a["session_id"],
+        ticker=a.get("ticker"),
+        since=a.get("since"),
+        limit=a.get("limit", 100),
+        instance=a.get("instance"),
+    ),
+    "harman_order_timeline": lambda cfg, a: harman_order_timeline(
+        cfg,
+        order_id=a["order_id"],
+        instance=a.get("instance"),
+    ),
+    "harman_exchange_audit": lambda cfg, a: harman_exchange_audit(
+        cfg,
+        session_id=a["session_id"],
+        category=a.get("category"),
+        action=a.get("action"),
+        outcome=a.get("outcome"),
+        since=a.get("since"),
+        limit=a.get("limit", 100),
+        instance=a.get("instance"),
+    ),
+    "harman_settlements": lambda cfg, a: harman_settlements(
+        cfg,
+        session_id=a["session_id"],
+        ticker=a.get("ticker"),
+        since=a.get("since"),
+        instance=a.get("instance"),
+    ),
+    "list_pipelines": lambda cfg, a: list_pipelines(cfg),
+    "search_pipeline_runs": lambda cfg, a: search_pipeline_runs(
+        cfg,
+        pipeline_id=a["pipeline_id"],
+        limit=a.get("limit", 20),
+    ),
+    "get_pipeline_run_details": lambda cfg, a: get_pipeline_run_details(
+        cfg,
+        run_id=a["run_id"],
+    ),
+    "query_market_lifecycle": lambda cfg, a: query_market_lifecycle(
+        cfg,
+        ticker=a.get("ticker"),
+        event_ticker=a.get("event_ticker"),
+        since=a.get("since"),
+        limit=a.get("limit", 50),
+    ),
+}
+
+
+# Tools with a native async implementation, awaited on the event loop
+_ASYNC_TOOL_DISPATCH: dict[str, Callable[[Config, dict], Awaitable[str]]] = {
+    "lookup_market": lambda cfg, a: lookup_market_async(
+        cfg,
+        ids=a["ids"],
+        feed=a.get("feed"),
+    ),
+}
 
 
 def _run_tool(cfg: Config, name: str, arguments: dict) -> str:
     """Dispatch tool call to implementation."""
-    if name == "query_trades":
-        return query_trades(
-            cfg,
-            feed=arguments["feed"],
-            date_str=arguments.get("date"),
-            limit=arguments.get("limit", 20),
-        )
-    elif name == "query_prices":
-        return query_prices(
-            cfg,
-            feed=arguments["feed"],
-            date_str=arguments.get("date"),
-            hour=arguments.get("hour"),
-        )
-    elif name == "query_snap":
-        return query_snap(
-            cfg,
-            feed=arguments["feed"],
-            tickers=arguments.get("tickers"),
-        )
-    elif name == "lookup_market":
-        return lookup_market(
-            cfg,
-            ids=arguments["ids"],
-            feed=arguments.get("feed"),
-        )
-    elif name == "list_feeds":
-        return list_feeds(cfg)
-    elif name == "check_freshness":
-        return check_freshness(
-            cfg,
-            feed=arguments.get("feed"),
-        )
-    elif name == "query_events":
-        return query_events(
-            cfg,
-            feed=arguments["feed"],
-            date_str=arguments.get("date"),
-            limit=arguments.get("limit", 20),
-        )
-    elif name == "query_volume":
-        return query_volume(
-            cfg,
-            date_str=arguments.get("date"),
-            feed=arguments.get("feed"),
-        )
-    elif name == "browse_categories":
-        return browse_categories(cfg)
-    elif name == "browse_series":
-        return browse_series(cfg, category=arguments["category"])
-    elif name == "browse_events":
-        return browse_events(cfg, series=arguments["series"])
-    elif name == "browse_markets":
-        return browse_markets(cfg, event=arguments["event"])
-    elif name == "secmaster_stats":
-        return secmaster_stats(cfg)
-    elif name == "search_markets":
-        return search_markets(
-            cfg,
-            category=arguments.get("category"),
-            series=arguments.get("series"),
-            status=arguments.get("status"),
-            event=arguments.get("event"),
-            close_within_hours=arguments.get("close_within_hours"),
-            closing_after=arguments.get("closing_after"),
-            as_of=arguments.get("as_of"),
-            games_only=arguments.get("games_only"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "search_events":
-        return search_events(
-            cfg,
-            category=arguments.get("category"),
-            series=arguments.get("series"),
-            status=arguments.get("status"),
-            as_of=arguments.get("as_of"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "search_pairs":
-        return search_pairs(
-            cfg,
-            exchange=arguments.get("exchange"),
-            base=arguments.get("base"),
-            quote=arguments.get("quote"),
-            market_type=arguments.get("market_type"),
-            status=arguments.get("status"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "search_conditions":
-        return search_conditions(
-            cfg,
-            category=arguments.get("category"),
-            status=arguments.get("status"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "search_lifecycle":
-        return search_lifecycle(
-            cfg,
-            status=arguments.get("status"),
-            since=arguments.get("since"),
-            feed=arguments.get("feed"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "get_fees":
-        return get_fees(
-            cfg,
-            series=arguments.get("series"),
-            as_of=arguments.get("as_of"),
-            limit=arguments.get("limit"),
-        )
-    elif name == "list_api_keys":
-        return list_api_keys(
-            cfg,
-            include_revoked=arguments.get("include_revoked", False),
-        )
-    elif name == "query_key_usage":
-        return query_key_usage(
-            cfg,
-            key_prefix=arguments.get("key_prefix"),
-        )
-    elif name == "harman_sessions":
-        return harman_sessions(cfg)
-    elif name == "harman_orders":
-        return harman_orders(
-            cfg,
-            session_id=arguments["session_id"],
-            state=arguments.get("state"),
-            ticker=arguments.get("ticker"),
-            since=arguments.get("since"),
-            limit=arguments.get("limit", 100),
-            instance=arguments.get("instance"),
-        )
-    elif name == "harman_fills":
-        return harman_fills(
-            cfg,
-            session_id=arguments["session_id"],
-            ticker=arguments.get("ticker"),
-            since=arguments.get("since"),
-            limit=arguments.get("limit", 100),
-            instance=arguments.get("instance"),
-        )
-    elif name == "harman_order_timeline":
-        return harman_order_timeline(
-            cfg,
-            order_id=arguments["order_id"],
-            instance=arguments.get("instance"),
-        )
-    elif name == "harman_exchange_audit":
-        return harman_exchange_audit(
-            cfg,
-            session_id=arguments["session_id"],
-            category=arguments.get("category"),
-            action=arguments.get("action"),
-            outcome=arguments.get("outcome"),
-            since=arguments.get("since"),
-            limit=arguments.get("limit", 100),
-            instance=arguments.get("instance"),
-        )
-    elif name == "harman_settlements":
-        return harman_settlements(
-            cfg,
-            session_id=arguments["session_id"],
-            ticker=arguments.get("ticker"),
-            since=arguments.get("since"),
-            instance=arguments.get("instance"),
-        )
-    elif name == "list_pipelines":
-        return list_pipelines(cfg)
-    elif name == "search_pipeline_runs":
-        return search_pipeline_runs(
-            cfg,
-            pipeline_id=arguments["pipeline_id"],
-            limit=arguments.get("limit", 20),
-        )
-    elif name == "get_pipeline_run_details":
-        return get_pipeline_run_details(
-            cfg,
-            run_id=arguments["run_id"],
-        )
-    elif name == "query_market_lifecycle":
-        return query_market_lifecycle(
-            cfg,
-            ticker=arguments.get("ticker"),
-            event_ticker=arguments.get("event_ticker"),
-            since=arguments.get("since"),
-            limit=arguments.get("limit", 50),
-        )
-    else:
-        return json.dumps({"error": f"Unknown tool: {name}"})
+    handler = _TOOL_DISPATCH.get(name)
+    if handler is None:
+        return dumps({"error": f"Unknown tool: {name}"})
+    return handler(cfg, arguments)
+
+
+async def _dispatch(
+    cfg: Config,
+    name: str,
+    arguments: dict,
+    executor: ThreadPoolExecutor,
+    limiter: asyncio.Semaphore,
+) -> str:
+    """Run a tool call under the concurrency limit; failures become an error result."""
+    try:
+        async with limiter:
+            async_handler = _ASYNC_TOOL_DISPATCH.get(name)
+            if async_handler is not None:
+                return await async_handler(cfg, arguments)
+            # Tool handlers block on HTTP; keep the stdio loop responsive
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, _run_tool, cfg, name, arguments)
+    except Exception as e:
+        # Render the traceback off the event loop
+        await asyncio.to_thread(logger.error, "Tool %s failed", name, exc_info=e)
+        return dumps({"error": str(e)})
+
+
+def _call_key(name: str, arguments: dict) -> tuple[str, bytes] | None:
+    """Key identifying identical calls, or None if arguments can't be keyed."""
+    try:
+        return name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS)
+    except TypeError:
+        # orjson rejects e.g. integers beyond 64 bits; just don't coalesce
+        return None
+
+
+async def _coalesced(
+    inflight: dict[tuple[str, bytes], asyncio.Future[str]],
+    key: tuple[str, bytes] | None,
+    call: Callable[[], Awaitable[str]],
+) -> str:
+    """Await call(), sharing one execution among concurrent callers with the same key."""
+    if key is None:
+        return await call()
+    future = inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(call())
+        inflight[key] = future
+        future.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shielded so one caller cancelling doesn't cancel the others' result
+    return await asyncio.shield(future)
 
 
 async def serve() -> None:
     """Run the MCP server with stdio transport."""
     cfg = load_config()
+    configure_caches(cfg)
     server = Server("ssmd-mcp")
+    executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="ssmd-tool")
+    limiter = asyncio.Semaphore(TOOL_CONCURRENCY)
 
     @server.list_tools()
     async def handle_list_tools() -> list[Tool]:
-        return TOOLS
+        return _TOOL_LIST
 
-    @server.call_tool()
-    async def handle_call_tool(name: str, arguments: dict | None) -> list[TextContent]:
-        arguments = arguments or {}
-        try:
-            result = _run_tool(cfg, name, arguments)
-        except Exception as e:
-            logger.exception("Tool %s failed", name)
-            result = json.dumps({"error": str(e)})
-        return [TextContent(type="text", text=result)]
+    # Identical concurrent calls share one execution; every tool is read-only
+    inflight: dict[tuple[str, bytes], asyncio.Future[str]] = {}
+
+    @server.call_tool(validate_input=False)
+    async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
+        # The SDK substitutes {} for missing arguments, so no per-call fallback here
+        # Raised before dispatch so the SDK reports it as an isError result
+        _validate_arguments(name, arguments)
+        result = await _coalesced(
+            inflight,
+            _call_key(name, arguments),
+            lambda: _dispatch(cfg, name, arguments, executor, limiter),
+        )
+        # result is always a str, so skip pydantic validation
+        return [TextContent.model_construct(type="text", text=result)]
 
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        await aclose_clients()
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """Log INFO+ to stderr via a queue so writes happen on a background thread."""
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
 
 
 def main() -> None:
     """Entry point for ssmd-mcp server."""
-    asyncio.run(serve())
+    listener = _start_logging()
+    try:
+        try:
+            import uvloop  # not available on Windows
+        except ImportError:
+            asyncio.run(serve())
+        else:
+            uvloop.run(serve())
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
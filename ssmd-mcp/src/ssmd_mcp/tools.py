@@ -1,94 +1,152 @@
 """MCP tool implementations for ssmd-mcp — pure API client."""
 
-import json
 import logging
-import re
+import string
 from typing import Any
 
+import orjson
+
 from ssmd_mcp.config import Config
-from ssmd_mcp.api import api_get, lookup_markets
+from ssmd_mcp.api import api_get, api_get_text, cached_get, fanout, lookup_markets, lookup_markets_async
 
 logger = logging.getLogger(__name__)
 
 MAX_LIMIT = 500
-_SERIES_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Response cache TTLs (seconds): the feed list rarely changes, while
+# freshness is what callers poll, so it only absorbs bursts of repeat calls
+FEEDS_TTL = 300.0
+FRESHNESS_TTL = 30.0
+# Monitor index, secmaster stats and fee schedules change on a minute-or-slower scale
+REFERENCE_TTL = 60.0
+# Secmaster searches and the key list: short enough that new markets and
+# revocations show up promptly, long enough to absorb repeat calls in a turn
+SEARCH_TTL = 30.0
+# Series expanded with their events by browse_tree at depth 2; each is one
+# upstream request, so large categories are truncated
+MAX_TREE_SERIES = 50
+# Series tickers are short alphanumerics; checked as a set rather than a regex,
+# whose $ would also accept a trailing newline
+_SERIES_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+# series_fees.series_ticker is varchar(128)
+MAX_SERIES_LEN = 128
+
+
+def dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON text with orjson.
+
+    Non-str dict keys are stringified as stdlib json does, rather than raising.
+    """
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_INVALID_SERIES = dumps({"error": "Invalid series format"})
+
+
+def _compact(**params: Any) -> dict[str, Any]:
+    """Build query params, dropping unset values (None, False, or empty string)."""
+    return {k: v for k, v in params.items() if v is not None and v is not False and v != ""}
 
 
-def query_trades(cfg: Config, feed: str, date_str: str | None = None, limit: int = 20) -> str:
+def _project(result: Any, fields: list[str] | None) -> Any:
+    """Keep only the requested fields in each row of a result's top-level lists.
+
+    ssmd-data-ts returns full rows, so projection happens client-side; it still
+    trims serialization and the text handed back to the caller.
+    """
+    if not fields or not isinstance(result, dict):
+        return result
+    return {
+        key: [
+            {f: row[f] for f in fields if f in row} if isinstance(row, dict) else row
+            for row in value
+        ] if isinstance(value, list) else value
+        for key, value in result.items()
+    }
+
+
+def query_trades(
+    cfg: Config,
+    feed: str,
+    date_str: str | None = None,
+    limit: int = 20,
+    fields: list[str] | None = None,
+) -> str:
     """Query trade data via ssmd-data-ts API."""
-    params: dict[str, Any] = {"feed": feed}
-    if date_str:
-        params["date"] = date_str
-    if limit != 20:
-        params["limit"] = limit
-    result = api_get(cfg, "/v1/data/trades", params)
-    return json.dumps(result, default=str)
+    params = _compact(feed=feed, date=date_str, limit=None if limit == 20 else limit)
+    if not fields:
+        return api_get_text(cfg, "/v1/data/trades", params)
+    return dumps(_project(api_get(cfg, "/v1/data/trades", params), fields))
 
 
-def query_prices(cfg: Config, feed: str, date_str: str | None = None, hour: str | None = None) -> str:
+def query_prices(
+    cfg: Config,
+    feed: str,
+    date_str: str | None = None,
+    hour: str | None = None,
+    fields: list[str] | None = None,
+) -> str:
     """Query price snapshots via ssmd-data-ts API."""
-    params: dict[str, Any] = {"feed": feed}
-    if date_str:
-        params["date"] = date_str
-    if hour:
-        params["hour"] = hour
-    result = api_get(cfg, "/v1/data/prices", params)
-    return json.dumps(result, default=str)
+    params = _compact(feed=feed, date=date_str, hour=hour)
+    if not fields:
+        return api_get_text(cfg, "/v1/data/prices", params)
+    return dumps(_project(api_get(cfg, "/v1/data/prices", params), fields))
 
 
-def query_snap(cfg: Config, feed: str, tickers: str | None = None) -> str:
+def query_snap(
+    cfg: Config,
+    feed: str,
+    tickers: str | None = None,
+    fields: list[str] | None = None,
+) -> str:
     """Query live ticker snapshots from Redis via ssmd-data-ts API."""
-    params: dict[str, Any] = {"feed": feed}
-    if tickers:
-        params["tickers"] = tickers
-    result = api_get(cfg, "/v1/data/snap", params)
-    return json.dumps(result, default=str)
+    params = _compact(feed=feed, tickers=tickers)
+    if not fields:
+        return api_get_text(cfg, "/v1/data/snap", params)
+    return dumps(_project(api_get(cfg, "/v1/data/snap", params), fields))
 
 
 def lookup_market(cfg: Config, ids: list[str], feed: str | None = None) -> str:
     """Look up market metadata via ssmd-data-ts API."""
     results = lookup_markets(cfg, ids, feed)
-    return json.dumps({
+    return dumps({
+        "count": len(results),
+        "markets": results,
+    })
+
+
+async def lookup_market_async(cfg: Config, ids: list[str], feed: str | None = None) -> str:
+    """Look up market metadata via ssmd-data-ts API without blocking the event loop."""
+    results = await lookup_markets_async(cfg, ids, feed)
+    return dumps({
         "count": len(results),
         "markets": results,
-    }, default=str)
+    })
 
 
 def list_feeds(cfg: Config) -> str:
     """List available feeds via ssmd-data-ts API."""
-    result = api_get(cfg, "/v1/data/feeds")
-    return json.dumps(result, default=str)
+    result = cached_get(cfg, "/v1/data/feeds", ttl=FEEDS_TTL)
+    return dumps(result)
 
 
 def check_freshness(cfg: Config, feed: str | None = None) -> str:
     """Check data freshness via ssmd-data-ts API."""
-    params: dict[str, Any] = {}
-    if feed:
-        params["feed"] = feed
-    result = api_get(cfg, "/v1/data/freshness", params)
-    return json.dumps(result, default=str)
+    params = _compact(feed=feed)
+    result = cached_get(cfg, "/v1/data/freshness", params, ttl=FRESHNESS_TTL)
+    return dumps(result)
 
 
 def query_events(cfg: Config, feed: str, date_str: str | None = None, limit: int = 20) -> str:
     """Query event-level trade summaries via ssmd-data-ts API."""
-    params: dict[str, Any] = {"feed": feed}
-    if date_str:
-        params["date"] = date_str
-    if limit != 20:
-        params["limit"] = limit
-    result = api_get(cfg, "/v1/data/events", params)
-    return json.dumps(result, default=str)
+    params = _compact(feed=feed, date=date_str, limit=None if limit == 20 else limit)
+    return api_get_text(cfg, "/v1/data/events", params)
 
 
 def query_volume(cfg: Config, date_str: str | None = None, feed: str | None = None) -> str:
     """Query volume summary via ssmd-data-ts API."""
-    params: dict[str, Any] = {}
-    if date_str:
-        params["date"] = date_str
-    if feed:
-        params["feed"] = feed
-    result = api_get(cfg, "/v1/data/volume", params)
-    return json.dumps(result, default=str)
+    params = _compact(date=date_str, feed=feed)
+    return api_get_text(cfg, "/v1/data/volume", params)
 
 
 # --- Monitor (hierarchical browsing) tools ---
@@ -96,26 +154,50 @@ def query_volume(cfg: Config, date_str: str | None = None, feed: str | None = No
 
 def browse_categories(cfg: Config) -> str:
     """Browse market categories from the monitor index cache."""
-    result = api_get(cfg, "/v1/monitor/categories")
-    return json.dumps(result, default=str)
+    result = cached_get(cfg, "/v1/monitor/categories", ttl=REFERENCE_TTL)
+    return dumps(result)
 
 
 def browse_series(cfg: Config, category: str) -> str:
     """Browse series within a category from the monitor index cache."""
-    result = api_get(cfg, "/v1/monitor/series", {"category": category})
-    return json.dumps(result, default=str)
+    result = cached_get(cfg, "/v1/monitor/series", {"category": category}, ttl=REFERENCE_TTL)
+    return dumps(result)
 
 
 def browse_events(cfg: Config, series: str) -> str:
     """Browse events within a series from the monitor index cache."""
-    result = api_get(cfg, "/v1/monitor/events", {"series": series})
-    return json.dumps(result, default=str)
+    result = cached_get(cfg, "/v1/monitor/events", {"series": series}, ttl=REFERENCE_TTL)
+    return dumps(result)
+
+
+def browse_tree(cfg: Config, category: str, depth: int = 1) -> str:
+    """Browse a category's series and, at depth 2, each series' events in one call.
+
+    The monitor index has no tree endpoint, so per-series event lists are
+    fetched concurrently through the response cache. Only the first
+    MAX_TREE_SERIES series are expanded; the result is then marked truncated.
+    """
+    result = cached_get(cfg, "/v1/monitor/series", {"category": category}, ttl=REFERENCE_TTL)
+    series = result.get("series")
+    if depth < 2 or not series:
+        return dumps(result if "error" in result else {**result, "category": category})
+
+    def fetch_events(s: dict[str, Any]) -> dict[str, Any]:
+        events = cached_get(cfg, "/v1/monitor/events", {"series": s["ticker"]}, ttl=REFERENCE_TTL)
+        if "error" in events:
+            return {**s, "error": events["error"]}
+        return {**s, "events": events.get("events", [])}
+
+    tree = {**result, "category": category, "series": fanout(fetch_events, series[:MAX_TREE_SERIES])}
+    if len(series) > MAX_TREE_SERIES:
+        tree["truncated"] = True
+        tree["totalSeries"] = len(series)
+    return dumps(tree)
 
 
 def browse_markets(cfg: Config, event: str) -> str:
     """Browse markets within an event with live prices from the monitor index cache."""
-    result = api_get(cfg, "/v1/monitor/markets", {"event": event})
-    return json.dumps(result, default=str)
+    return api_get_text(cfg, "/v1/monitor/markets", {"event": event})
 
 
 # --- Secmaster tools ---
@@ -130,8 +212,8 @@ def _clamp_limit(limit: int | None) -> int | None:
 
 def secmaster_stats(cfg: Config) -> str:
     """Get secmaster database statistics (event/market/pair/condition counts)."""
-    result = api_get(cfg, "/v1/secmaster/stats")
-    return json.dumps(result, default=str)
+    result = cached_get(cfg, "/v1/secmaster/stats", ttl=REFERENCE_TTL)
+    return dumps(result)
 
 
 def search_markets(
@@ -145,30 +227,22 @@ def search_markets(
     as_of: str | None = None,
     games_only: bool | None = None,
     limit: int | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Search Kalshi markets with filters."""
-    params: dict[str, Any] = {}
-    if category:
-        params["category"] = category
-    if series:
-        params["series"] = series
-    if status:
-        params["status"] = status
-    if event:
-        params["event"] = event
-    if close_within_hours is not None:
-        params["close_within_hours"] = close_within_hours
-    if closing_after:
-        params["closing_after"] = closing_after
-    if as_of:
-        params["as_of"] = as_of
-    if games_only:
-        params["games_only"] = "true"
-    clamped = _clamp_limit(limit)
-    if clamped is not None:
-        params["limit"] = clamped
-    result = api_get(cfg, "/v1/markets", params)
-    return json.dumps(result, default=str)
+    params = _compact(
+        category=category,
+        series=series,
+        status=status,
+        event=event,
+        close_within_hours=close_within_hours,
+        closing_after=closing_after,
+        as_of=as_of,
+        games_only="true" if games_only else None,
+        limit=_clamp_limit(limit),
+    )
+    result = cached_get(cfg, "/v1/markets", params, ttl=SEARCH_TTL)
+    return dumps(_project(result, fields))
 
 
 def search_events(
@@ -180,20 +254,15 @@ def search_events(
     limit: int | None = None,
 ) -> str:
     """Search Kalshi events with filters."""
-    params: dict[str, Any] = {}
-    if category:
-        params["category"] = category
-    if series:
-        params["series"] = series
-    if status:
-        params["status"] = status
-    if as_of:
-        params["as_of"] = as_of
-    clamped = _clamp_limit(limit)
-    if clamped is not None:
-        params["limit"] = clamped
-    result = api_get(cfg, "/v1/events", params)
-    return json.dumps(result, default=str)
+    params = _compact(
+        category=category,
+        series=series,
+        status=status,
+        as_of=as_of,
+        limit=_clamp_limit(limit),
+    )
+    result = cached_get(cfg, "/v1/events", params, ttl=SEARCH_TTL)
+    return dumps(result)
 
 
 def search_pairs(
@@ -206,22 +275,16 @@ def search_pairs(
     limit: int | None = None,
 ) -> str:
     """Search futures pairs with filters."""
-    params: dict[str, Any] = {}
-    if exchange:
-        params["exchange"] = exchange
-    if base:
-        params["base"] = base
-    if quote:
-        params["quote"] = quote
-    if market_type:
-        params["market_type"] = market_type
-    if status:
-        params["status"] = status
-    clamped = _clamp_limit(limit)
-    if clamped is not None:
-        params["limit"] = clamped
-    result = api_get(cfg, "/v1/pairs", params)
-    return json.dumps(result, default=str)
+    params = _compact(
+        exchange=exchange,
+        base=base,
+        quote=quote,
+        market_type=market_type,
+        status=status,
+        limit=_clamp_limit(limit),
+    )
+    result = cached_get(cfg, "/v1/pairs", params, ttl=SEARCH_TTL)
+    return dumps(result)
 
 
 def search_conditions(
@@ -231,16 +294,9 @@ def search_conditions(
     limit: int | None = None,
 ) -> str:
     """Search Polymarket conditions with filters."""
-    params: dict[str, Any] = {}
-    if category:
-        params["category"] = category
-    if status:
-        params["status"] = status
-    clamped = _clamp_limit(limit)
-    if clamped is not None:
-        params["limit"] = clamped
-    result = api_get(cfg, "/v1/conditions", params)
-    return json.dumps(result, default=str)
+    params = _compact(category=category, status=status, limit=_clamp_limit(limit))
+    result = cached_get(cfg, "/v1/conditions", params, ttl=SEARCH_TTL)
+    return dumps(result)
 
 
 def search_lifecycle(
@@ -249,20 +305,18 @@ def search_lifecycle(
     since: str | None = None,
     feed: str | None = None,
     limit: int | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Search markets by lifecycle status across all exchanges."""
-    params: dict[str, Any] = {}
-    if status:
-        params["status"] = status
-    if since:
-        params["since"] = since
-    if feed:
-        params["feed"] = feed
-    clamped = _clamp_limit(limit)
-    if clamped is not None:
-        params["limit"] = clamped
-    result = api_get(cfg, "/v1/secmaster/lifecycle", params)
-    return json.dumps(result, default=str)
+    params = _compact(
+        status=status,
+        since=since,
+        feed=feed,
+        limit=_clamp_limit(limit),
+    )
+    if not fields:
+        return api_get_text(cfg, "/v1/secmaster/lifecycle", params)
+    return dumps(_project(api_get(cfg, "/v1/secmaster/lifecycle", params), fields))
 
 
 def get_fees(
@@ -273,19 +327,14 @@ def get_fees(
 ) -> str:
     """Get fee schedules, optionally for a specific series."""
     if series:
-        if not _SERIES_RE.match(series):
-            return json.dumps({"error": "Invalid series format"})
-        params: dict[str, Any] = {}
-        if as_of:
-            params["as_of"] = as_of
-        result = api_get(cfg, f"/v1/fees/{series}", params if params else None)
+        if len(series) > MAX_SERIES_LEN or not _SERIES_CHARS.issuperset(series):
+            return _INVALID_SERIES
+        params = _compact(as_of=as_of)
+        result = cached_get(cfg, f"/v1/fees/{series}", params, ttl=REFERENCE_TTL)
     else:
-        params = {}
-        clamped = _clamp_limit(limit)
-        if clamped is not None:
-            params["limit"] = clamped
-        result = api_get(cfg, "/v1/fees", params if params else None)
-    return json.dumps(result, default=str)
+        params = _compact(limit=_clamp_limit(limit))
+        result = cached_get(cfg, "/v1/fees", params, ttl=REFERENCE_TTL)
+    return dumps(result)
 
 
 # --- Admin tools ---
@@ -293,54 +342,47 @@ def get_fees(
 
 def list_api_keys(cfg: Config, include_revoked: bool = False) -> str:
     """List all API keys with metadata via ssmd-data-ts API."""
-    result = api_get(cfg, "/v1/keys")
+    # ssmd-data-ts omits revoked keys unless include_revoked=true is passed
+    params = {"include_revoked": "true"} if include_revoked else None
+    result = cached_get(cfg, "/v1/keys", params, ttl=SEARCH_TTL)
     if "error" in result:
-        return json.dumps(result, default=str)
+        return dumps(result)
     keys = result.get("keys", [])
-    if not include_revoked:
-        keys = [k for k in keys if not k.get("revokedAt")]
-    return json.dumps({"count": len(keys), "keys": keys}, default=str)
+    return dumps({"count": len(keys), "keys": keys})
+
+
+def _merge_usage(usage: list[dict[str, Any]], requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Attach per-key request counts to usage entries in one pass keyed by prefix.
+
+    Usage entries come first, then keys that only have requests (e.g., no
+    rate limit data).
+    """
+    merged = {u.get("keyPrefix", ""): {**u, "totalRequests": 0, "endpoints": []} for u in usage}
+    for r in requests:
+        entry = merged.setdefault(r["keyPrefix"], {"keyPrefix": r["keyPrefix"]})
+        entry["totalRequests"] = r.get("totalRequests", 0)
+        entry["endpoints"] = r.get("endpoints", [])
+    return list(merged.values())
 
 
 def query_key_usage(cfg: Config, key_prefix: str | None = None) -> str:
     """Query API key usage stats (rate limits + token usage + request counts)."""
-    # Fetch rate limit / token usage from Redis
-    usage_result = api_get(cfg, "/v1/keys/usage")
-    usage = usage_result.get("usage", []) if "error" not in usage_result else []
+    # Rate limit / token usage (Redis) and per-key request counts (in-memory
+    # Prometheus counter) are independent, so fetch them concurrently
+    usage_result, requests_result = fanout(
+        lambda path: api_get(cfg, path), ("/v1/keys/usage", "/v1/keys/requests")
+    )
 
-    # Fetch per-key request counts from in-memory Prometheus counter
-    requests_result = api_get(cfg, "/v1/keys/requests")
-    requests_by_key: dict[str, Any] = {}
-    if "error" not in requests_result:
-        for k in requests_result.get("keys", []):
-            requests_by_key[k["keyPrefix"]] = k
-
-    # Merge: attach request counts to usage entries
-    merged = []
-    seen_prefixes: set[str] = set()
-    for u in usage:
-        prefix = u.get("keyPrefix", "")
-        seen_prefixes.add(prefix)
-        req_data = requests_by_key.get(prefix, {})
-        merged.append({
-            **u,
-            "totalRequests": req_data.get("totalRequests", 0),
-            "endpoints": req_data.get("endpoints", []),
-        })
-
-    # Add keys that have requests but aren't in usage (e.g., no rate limit data)
-    for prefix, req_data in requests_by_key.items():
-        if prefix not in seen_prefixes:
-            merged.append({
-                "keyPrefix": prefix,
-                "totalRequests": req_data.get("totalRequests", 0),
-                "endpoints": req_data.get("endpoints", []),
-            })
+    usage = usage_result.get("usage", []) if "error" not in usage_result else []
+    requests = requests_result.get("keys", []) if "error" not in requests_result else []
 
+    # Narrow both sides up front so the merge only touches the requested key
     if key_prefix:
-        merged = [m for m in merged if m.get("keyPrefix") == key_prefix]
+        usage = [u for u in usage if u.get("keyPrefix") == key_prefix]
+        requests = [r for r in requests if r["keyPrefix"] == key_prefix]
 
-    return json.dumps({"count": len(merged), "sincePodStart": True, "usage": merged}, default=str)
+    merged = _merge_usage(usage, requests)
+    return dumps({"count": len(merged), "sincePodStart": True, "usage": merged})
 
 
 # --- Harman Admin tools ---
@@ -348,8 +390,7 @@ def query_key_usage(cfg: Config, key_prefix: str | None = None) -> str:
 
 def harman_sessions(cfg: Config) -> str:
     """List all harman sessions with risk/status summary."""
-    result = api_get(cfg, "/v1/harman/sessions")
-    return json.dumps(result, indent=2, default=str)
+    return api_get_text(cfg, "/v1/harman/sessions")
 
 
 def harman_orders(
@@ -362,17 +403,14 @@ def harman_orders(
     instance: str | None = None,
 ) -> str:
     """Query orders for a harman session."""
-    params: dict[str, Any] = {"limit": limit}
-    if state:
-        params["state"] = state
-    if ticker:
-        params["ticker"] = ticker
-    if since:
-        params["since"] = since
-    if instance:
-        params["instance"] = instance
-    result = api_get(cfg, f"/v1/harman/sessions/{session_id}/orders", params)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(
+        limit=limit,
+        state=state,
+        ticker=ticker,
+        since=since,
+        instance=instance,
+    )
+    return api_get_text(cfg, f"/v1/harman/sessions/{session_id}/orders", params)
 
 
 def harman_fills(
@@ -384,24 +422,19 @@ def harman_fills(
     instance: str | None = None,
 ) -> str:
     """Query fills for a harman session."""
-    params: dict[str, Any] = {"limit": limit}
-    if ticker:
-        params["ticker"] = ticker
-    if since:
-        params["since"] = since
-    if instance:
-        params["instance"] = instance
-    result = api_get(cfg, f"/v1/harman/sessions/{session_id}/fills", params)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(
+        limit=limit,
+        ticker=ticker,
+        since=since,
+        instance=instance,
+    )
+    return api_get_text(cfg, f"/v1/harman/sessions/{session_id}/fills", params)
 
 
 def harman_order_timeline(cfg: Config, order_id: int, instance: str | None = None) -> str:
     """Get full order lifecycle timeline."""
-    params: dict[str, Any] = {}
-    if instance:
-        params["instance"] = instance
-    result = api_get(cfg, f"/v1/harman/orders/{order_id}/timeline", params if params else None)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(instance=instance)
+    return api_get_text(cfg, f"/v1/harman/orders/{order_id}/timeline", params or None)
 
 
 def harman_exchange_audit(
@@ -415,19 +448,15 @@ def harman_exchange_audit(
     instance: str | None = None,
 ) -> str:
     """Query exchange audit log for a harman session."""
-    params: dict[str, Any] = {"limit": limit}
-    if category:
-        params["category"] = category
-    if action:
-        params["action"] = action
-    if outcome:
-        params["outcome"] = outcome
-    if since:
-        params["since"] = since
-    if instance:
-        params["instance"] = instance
-    result = api_get(cfg, f"/v1/harman/sessions/{session_id}/exchange-audit", params)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(
+        limit=limit,
+        category=category,
+        action=action,
+        outcome=outcome,
+        since=since,
+        instance=instance,
+    )
+    return api_get_text(cfg, f"/v1/harman/sessions/{session_id}/exchange-audit", params)
 
 
 def harman_settlements(
@@ -438,15 +467,8 @@ def harman_settlements(
     instance: str | None = None,
 ) -> str:
     """Query settlements for a harman session."""
-    params: dict[str, Any] = {}
-    if ticker:
-        params["ticker"] = ticker
-    if since:
-        params["since"] = since
-    if instance:
-        params["instance"] = instance
-    result = api_get(cfg, f"/v1/harman/sessions/{session_id}/settlements", params if params else None)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(ticker=ticker, since=since, instance=instance)
+    return api_get_text(cfg, f"/v1/harman/sessions/{session_id}/settlements", params or None)
 
 
 # --- Pipeline debugging tools ---
@@ -454,8 +476,7 @@ def harman_settlements(
 
 def list_pipelines(cfg: Config) -> str:
     """List all pipeline definitions with last run status."""
-    result = api_get(cfg, "/v1/pipelines")
-    return json.dumps(result, indent=2, default=str)
+    return api_get_text(cfg, "/v1/pipelines")
 
 
 def search_pipeline_runs(
@@ -468,13 +489,12 @@ def search_pipeline_runs(
     runs = result if isinstance(result, list) else result.get("runs", [])
     # Limit results
     runs = runs[:limit]
-    return json.dumps({"count": len(runs), "runs": runs}, indent=2, default=str)
+    return dumps({"count": len(runs), "runs": runs})
 
 
 def get_pipeline_run_details(cfg: Config, run_id: int) -> str:
     """Get full pipeline run details including stage results."""
-    result = api_get(cfg, f"/v1/pipelines/runs/{run_id}")
-    return json.dumps(result, indent=2, default=str)
+    return api_get_text(cfg, f"/v1/pipelines/runs/{run_id}")
 
 
 def query_market_lifecycle(
@@ -485,12 +505,10 @@ def query_market_lifecycle(
     limit: int = 50,
 ) -> str:
     """Query market lifecycle events (created, activated, determined, settled, etc.)."""
-    params: dict[str, Any] = {"limit": limit}
-    if ticker:
-        params["ticker"] = ticker
-    if event_ticker:
-        params["event_ticker"] = event_ticker
-    if since:
-        params["since"] = since
-    result = api_get(cfg, "/v1/monitor/lifecycle", params)
-    return json.dumps(result, indent=2, default=str)
+    params = _compact(
+        limit=limit,
+        ticker=ticker,
+        event_ticker=event_ticker,
+        since=since,
+    )
+    return api_get_text(cfg, "/v1/monitor/lifecycle", params)
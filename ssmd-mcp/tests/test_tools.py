@@ -8,20 +8,29 @@ Each test:
   4. Asserts the response is valid JSON with expected structure
 """
 
+import asyncio
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 import pytest
 import respx
+from jsonschema import Draft202012Validator
 
-from ssmd_mcp.config import Config
+from ssmd_mcp.config import Config, load_config
 from ssmd_mcp import api as api_module
+from ssmd_mcp import server as server_module
+from ssmd_mcp import tools as tools_module
 from ssmd_mcp.tools import (
+    browse_tree,
     check_freshness,
+    dumps,
     get_fees,
     list_api_keys,
     list_feeds,
     lookup_market,
+    lookup_market_async,
     query_events,
     query_key_usage,
     query_prices,
@@ -50,10 +59,19 @@ def cfg_no_url():
 
 @pytest.fixture(autouse=True)
 def _clear_market_cache():
-    """Clear the in-memory market cache between tests."""
+    """Clear the in-memory market and response caches between tests."""
     api_module._market_cache.clear()
+    api_module._response_cache.clear()
     yield
     api_module._market_cache.clear()
+    api_module._response_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _close_clients():
+    """Close pooled httpx clients between tests."""
+    yield
+    api_module.close_clients()
 
 
 # ---------------------------------------------------------------------------
@@ -99,6 +117,26 @@ def test_query_trades_with_date_and_limit(cfg):
     assert parsed["date"] == "2026-02-15"
 
 
+@respx.mock
+def test_query_trades_projects_fields(cfg):
+    """fields keeps only the named keys in each row; other top-level keys are untouched."""
+    mock_response = {
+        "feed": "kalshi",
+        "count": 1,
+        "trades": [{"ticker": "BTC-YES", "trade_count": 100, "volume": 50000}],
+    }
+    route = respx.get(f"{TEST_API_URL}/v1/data/trades").mock(
+        return_value=httpx.Response(200, json=mock_response)
+    )
+
+    result = query_trades(cfg, "kalshi", fields=["ticker", "volume"])
+    parsed = json.loads(result)
+
+    assert "fields" not in route.calls.last.request.url.params
+    assert parsed["feed"] == "kalshi"
+    assert parsed["trades"] == [{"ticker": "BTC-YES", "volume": 50000}]
+
+
 # ---------------------------------------------------------------------------
 # query_prices
 # ---------------------------------------------------------------------------
@@ -212,6 +250,21 @@ def test_query_volume_with_feed_filter(cfg):
     assert parsed["feeds"][0]["feed"] == "kalshi"
 
 
+@respx.mock
+def test_query_volume_passes_body_through(cfg):
+    """Untransformed responses are returned verbatim; errors keep the error shape."""
+    body = '{"date": "2026-01-01", "feeds": []}'
+    respx.get(f"{TEST_API_URL}/v1/data/volume", params={"feed": "kalshi"}).mock(
+        return_value=httpx.Response(200, text=body)
+    )
+    respx.get(f"{TEST_API_URL}/v1/data/volume", params={"feed": "polymarket"}).mock(
+        return_value=httpx.Response(404, text="not found")
+    )
+
+    assert query_volume(cfg, feed="kalshi") == body
+    assert json.loads(query_volume(cfg, feed="polymarket")) == {"error": "API returned 404: not found"}
+
+
 # ---------------------------------------------------------------------------
 # lookup_market
 # ---------------------------------------------------------------------------
@@ -279,6 +332,203 @@ def test_lookup_market_uses_cache(cfg):
     assert parsed["markets"][0]["market_ticker"] == "CACHED1"
 
 
+@respx.mock
+def test_lookup_market_preserves_request_order(cfg):
+    """Cached and freshly fetched markets come back in the order requested."""
+    respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=_echo_lookup)
+    lookup_market(cfg, ["B"])
+
+    parsed = json.loads(lookup_market(cfg, ["C", "B", "A", "C"]))
+
+    assert [m["id"] for m in parsed["markets"]] == ["C", "B", "A"]
+
+
+@respx.mock
+def test_lookup_market_cache_key_ignores_padding_not_case(cfg):
+    """Padded IDs share a cache entry; IDs differing in case are distinct upstream."""
+    known = {"KXBTCD-T1"}
+
+    def exact_lookup(request):
+        ids = request.url.params["ids"].split(",")
+        return httpx.Response(200, json={"markets": [{"id": i} for i in ids if i in known]})
+
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=exact_lookup)
+
+    lookup_market(cfg, ["KXBTCD-T1"])
+    parsed = json.loads(lookup_market(cfg, [" KXBTCD-T1 ", "kxbtcd-t1"]))
+
+    assert route.call_count == 2
+    assert route.calls.last.request.url.params["ids"] == "kxbtcd-t1"
+    assert [m["id"] for m in parsed["markets"]] == ["KXBTCD-T1"]
+
+
+def _echo_lookup(request):
+    ids = request.url.params["ids"].split(",")
+    return httpx.Response(200, json={"markets": [{"id": i, "market_ticker": i} for i in ids]})
+
+
+@respx.mock
+def test_lookup_market_chunks_large_id_lists(cfg):
+    """IDs beyond LOOKUP_CHUNK_SIZE are split across multiple requests."""
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=_echo_lookup)
+    ids = [f"T{i}" for i in range(api_module.LOOKUP_CHUNK_SIZE + 50)]
+
+    result = lookup_market(cfg, ids)
+    parsed = json.loads(result)
+
+    assert route.call_count == 2
+    assert parsed["count"] == len(ids)
+    assert {m["id"] for m in parsed["markets"]} == set(ids)
+    sizes = sorted(len(c.request.url.params["ids"].split(",")) for c in route.calls)
+    assert sizes == [50, api_module.LOOKUP_CHUNK_SIZE]
+
+
+@respx.mock
+def test_lookup_market_dedupes_ids(cfg):
+    """Repeated IDs are requested and returned once."""
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=_echo_lookup)
+
+    result = lookup_market(cfg, ["T1", "T2", "T1", "T2", "T3"])
+    parsed = json.loads(result)
+
+    assert route.calls.last.request.url.params["ids"] == "T1,T2,T3"
+    assert parsed["count"] == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_lookup_market_async(cfg):
+    mock_response = {
+        "markets": [{"id": "TICKER1", "market_ticker": "TICKER1", "name": "Test Market"}]
+    }
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup", params={"ids": "TICKER1"}).mock(
+        return_value=httpx.Response(200, json=mock_response)
+    )
+
+    try:
+        result = await lookup_market_async(cfg, ["TICKER1"])
+        parsed = json.loads(result)
+        assert parsed["count"] == 1
+        assert parsed["markets"][0]["market_ticker"] == "TICKER1"
+
+        # Shares the market cache with the sync path
+        lookup_market(cfg, ["TICKER1"])
+        assert route.call_count == 1
+    finally:
+        await api_module.aclose_clients()
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_lookup_market_async_chunks_large_id_lists(cfg):
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=_echo_lookup)
+    ids = [f"T{i}" for i in range(api_module.LOOKUP_CHUNK_SIZE * 2 + 1)]
+
+    try:
+        result = await lookup_market_async(cfg, ids)
+    finally:
+        await api_module.aclose_clients()
+    parsed = json.loads(result)
+
+    assert route.call_count == 3
+    assert parsed["count"] == len(ids)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_size", [4096, 0])
+@respx.mock
+async def test_lookup_market_async_shares_inflight_ids(cfg, monkeypatch, cache_size):
+    """Concurrent lookups with overlapping IDs fetch each shared ID once, even uncached."""
+    monkeypatch.setattr(api_module._market_cache, "capacity", cache_size)
+
+    async def slow_echo(request):
+        await asyncio.sleep(0.01)
+        return _echo_lookup(request)
+
+    route = respx.get(f"{TEST_API_URL}/v1/markets/lookup").mock(side_effect=slow_echo)
+
+    try:
+        first, second = await asyncio.gather(
+            lookup_market_async(cfg, ["A", "B"]),
+            lookup_market_async(cfg, ["B", "C"]),
+        )
+    finally:
+        await api_module.aclose_clients()
+
+    requested = [i for c in route.calls for i in c.request.url.params["ids"].split(",")]
+    assert sorted(requested) == ["A", "B", "C"]
+    assert {m["id"] for m in json.loads(first)["markets"]} == {"A", "B"}
+    assert {m["id"] for m in json.loads(second)["markets"]} == {"B", "C"}
+    assert api_module._inflight_markets == {}
+
+
+@pytest.mark.asyncio
+async def test_lookup_market_async_not_configured(cfg_no_url):
+    result = await lookup_market_async(cfg_no_url, ["TICKER1"])
+    parsed = json.loads(result)
+
+    assert parsed["count"] == 1
+    assert "error" in parsed["markets"][0]
+
+
+def test_market_cache_evicts_least_recently_used():
+    cache = api_module._TTLCache(capacity=2, ttl=300.0)
+    cache.put("a", {"id": "a"})
+    cache.put("b", {"id": "b"})
+    cache.get("a")  # a is now most recently used
+    cache.put("c", {"id": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": "a"}
+    assert cache.get("c") == {"id": "c"}
+    assert len(cache) == 2
+
+
+def test_market_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api_module.time, "monotonic", lambda: now[0])
+    cache = api_module._TTLCache(capacity=10, ttl=60.0)
+    cache.put("a", {"id": "a"})
+
+    now[0] += 59.0
+    assert cache.get("a") == {"id": "a"}
+    now[0] += 1.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_market_cache_configured_from_env(monkeypatch):
+    monkeypatch.setenv("SSMD_MARKET_CACHE_SIZE", "10")
+    monkeypatch.setenv("SSMD_MARKET_CACHE_TTL", "15")
+    monkeypatch.setattr(api_module._market_cache, "capacity", api_module._market_cache.capacity)
+    monkeypatch.setattr(api_module._market_cache, "ttl", api_module._market_cache.ttl)
+
+    api_module.configure_caches(load_config())
+
+    assert api_module._market_cache.capacity == 10
+    assert api_module._market_cache.ttl == 15.0
+
+
+def test_market_cache_resize_evicts_oldest():
+    cache = api_module._TTLCache(capacity=4)
+    for i in range(4):
+        cache.put(i, i)
+
+    cache.resize(2, 60.0)
+
+    assert len(cache) == 2
+    assert cache.get(0) is None
+    assert cache.get(3) == 3
+    assert cache.ttl == 60.0
+
+
+def test_market_cache_rejects_negative_size(monkeypatch):
+    monkeypatch.setenv("SSMD_MARKET_CACHE_SIZE", "-1")
+
+    with pytest.raises(ValueError, match="SSMD_MARKET_CACHE_SIZE"):
+        load_config()
+
+
 # ---------------------------------------------------------------------------
 # list_feeds
 # ---------------------------------------------------------------------------
@@ -304,6 +554,35 @@ def test_list_feeds(cfg):
     assert parsed["feeds"][0]["name"] == "kalshi"
 
 
+@respx.mock
+def test_list_feeds_uses_cache(cfg):
+    """Second call within the TTL should not make another HTTP request."""
+    route = respx.get(f"{TEST_API_URL}/v1/data/feeds").mock(
+        return_value=httpx.Response(200, json={"feeds": [{"name": "kalshi"}]})
+    )
+
+    list_feeds(cfg)
+    result = list_feeds(cfg)
+    parsed = json.loads(result)
+
+    assert route.call_count == 1
+    assert parsed["feeds"][0]["name"] == "kalshi"
+
+
+@respx.mock
+def test_list_feeds_does_not_cache_errors(cfg):
+    route = respx.get(f"{TEST_API_URL}/v1/data/feeds").mock(
+        side_effect=[
+            httpx.Response(500, json={"error": "Internal Server Error"}),
+            httpx.Response(200, json={"feeds": []}),
+        ]
+    )
+
+    assert "error" in json.loads(list_feeds(cfg))
+    assert json.loads(list_feeds(cfg)) == {"feeds": []}
+    assert route.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # check_freshness
 # ---------------------------------------------------------------------------
@@ -343,6 +622,64 @@ def test_check_freshness_specific_feed(cfg):
     assert parsed["feeds"][0]["feed"] == "kalshi"
 
 
+# ---------------------------------------------------------------------------
+# browse_tree
+# ---------------------------------------------------------------------------
+
+
+@respx.mock
+def test_browse_tree_series_only(cfg):
+    respx.get(f"{TEST_API_URL}/v1/monitor/series", params={"category": "Crypto"}).mock(
+        return_value=httpx.Response(200, json={"series": [{"ticker": "KXBTCD"}]})
+    )
+    events_route = respx.get(f"{TEST_API_URL}/v1/monitor/events")
+
+    parsed = json.loads(browse_tree(cfg, "Crypto"))
+
+    assert parsed == {"category": "Crypto", "series": [{"ticker": "KXBTCD"}]}
+    assert events_route.call_count == 0
+
+
+@respx.mock
+def test_browse_tree_with_events(cfg):
+    """depth=2 nests each series' events; a failed series carries its error."""
+    respx.get(f"{TEST_API_URL}/v1/monitor/series").mock(
+        return_value=httpx.Response(200, json={"series": [{"ticker": "KXBTCD"}, {"ticker": "KXETHD"}]})
+    )
+    respx.get(f"{TEST_API_URL}/v1/monitor/events", params={"series": "KXBTCD"}).mock(
+        return_value=httpx.Response(200, json={"events": [{"ticker": "KXBTCD-26MAR1619"}]})
+    )
+    respx.get(f"{TEST_API_URL}/v1/monitor/events", params={"series": "KXETHD"}).mock(
+        return_value=httpx.Response(404, json={"error": "not found"})
+    )
+
+    parsed = json.loads(browse_tree(cfg, "Crypto", depth=2))
+
+    assert parsed.keys() == {"category", "series"}
+    assert parsed["category"] == "Crypto"
+    btc, eth = parsed["series"]
+    assert btc["events"] == [{"ticker": "KXBTCD-26MAR1619"}]
+    assert "error" in eth
+
+
+@respx.mock
+def test_browse_tree_truncates_large_categories(cfg):
+    series = [{"ticker": f"S{i}"} for i in range(tools_module.MAX_TREE_SERIES + 5)]
+    respx.get(f"{TEST_API_URL}/v1/monitor/series").mock(
+        return_value=httpx.Response(200, json={"series": series})
+    )
+    events_route = respx.get(f"{TEST_API_URL}/v1/monitor/events").mock(
+        return_value=httpx.Response(200, json={"events": []})
+    )
+
+    parsed = json.loads(browse_tree(cfg, "Crypto", depth=2))
+
+    assert events_route.call_count == tools_module.MAX_TREE_SERIES
+    assert len(parsed["series"]) == tools_module.MAX_TREE_SERIES
+    assert parsed["truncated"] is True
+    assert parsed["totalSeries"] == len(series)
+
+
 # ---------------------------------------------------------------------------
 # secmaster_stats
 # ---------------------------------------------------------------------------
@@ -369,6 +706,21 @@ def test_secmaster_stats(cfg):
     assert parsed["conditions"]["total"] == 200
 
 
+@respx.mock
+def test_secmaster_stats_cached(cfg):
+    """Reference data is served from the response cache on repeat calls."""
+    route = respx.get(f"{TEST_API_URL}/v1/secmaster/stats").mock(
+        return_value=httpx.Response(200, json={"events": {"total": 100}})
+    )
+
+    first = secmaster_stats(cfg)
+    second = secmaster_stats(cfg)
+
+    assert first == second
+    assert route.call_count == 1
+    assert api_module._response_cache.hits == 1
+
+
 # ---------------------------------------------------------------------------
 # search_markets
 # ---------------------------------------------------------------------------
@@ -599,6 +951,26 @@ def test_get_fees_invalid_series(cfg):
     assert parsed["error"] == "Invalid series format"
 
 
+@pytest.mark.parametrize("series", ["KXBTCD\n", "K" * 129])
+def test_get_fees_rejects_trailing_newline_and_long_series(cfg, series):
+    parsed = json.loads(get_fees(cfg, series=series))
+
+    assert parsed["error"] == "Invalid series format"
+
+
+@respx.mock
+def test_get_fees_accepts_max_length_series(cfg):
+    """Series up to the schema's varchar(128) reach the API."""
+    series = "K" * 128
+    route = respx.get(f"{TEST_API_URL}/v1/fees/{series}").mock(
+        return_value=httpx.Response(200, json={"fees": []})
+    )
+
+    get_fees(cfg, series=series)
+
+    assert route.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # list_api_keys
 # ---------------------------------------------------------------------------
@@ -615,23 +987,17 @@ def test_list_api_keys(cfg):
                 "scopes": ["read"],
                 "revokedAt": None,
             },
-            {
-                "prefix": "sk_def",
-                "name": "revoked-key",
-                "email": "test@example.com",
-                "scopes": ["read"],
-                "revokedAt": "2026-01-15T00:00:00Z",
-            },
         ]
     }
-    respx.get(f"{TEST_API_URL}/v1/keys").mock(
+    route = respx.get(f"{TEST_API_URL}/v1/keys").mock(
         return_value=httpx.Response(200, json=mock_response)
     )
 
     result = list_api_keys(cfg)
     parsed = json.loads(result)
 
-    # Default excludes revoked keys
+    # Default leaves revoked keys to the upstream filter
+    assert "include_revoked" not in route.calls.last.request.url.params
     assert parsed["count"] == 1
     assert parsed["keys"][0]["prefix"] == "sk_abc"
 
@@ -644,7 +1010,7 @@ def test_list_api_keys_include_revoked(cfg):
             {"prefix": "sk_def", "name": "revoked", "revokedAt": "2026-01-15T00:00:00Z"},
         ]
     }
-    respx.get(f"{TEST_API_URL}/v1/keys").mock(
+    respx.get(f"{TEST_API_URL}/v1/keys", params={"include_revoked": "true"}).mock(
         return_value=httpx.Response(200, json=mock_response)
     )
 
@@ -781,6 +1147,43 @@ def test_api_404_returns_error(cfg):
     assert "error" in parsed
 
 
+@respx.mock
+def test_api_429_retries_after_delay(cfg, monkeypatch):
+    """Throttled responses are retried, honoring Retry-After."""
+    sleeps = []
+    monkeypatch.setattr(api_module.time, "sleep", sleeps.append)
+    route = respx.get(f"{TEST_API_URL}/v1/secmaster/stats").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json={"markets": {"total": 1}}),
+        ]
+    )
+
+    result = secmaster_stats(cfg)
+    parsed = json.loads(result)
+
+    assert route.call_count == 2
+    assert sleeps == [2.0]
+    assert parsed["markets"]["total"] == 1
+
+
+@respx.mock
+def test_api_503_gives_up_after_max_retries(cfg, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api_module.time, "sleep", sleeps.append)
+    route = respx.get(f"{TEST_API_URL}/v1/secmaster/stats").mock(
+        return_value=httpx.Response(503, json={"error": "unavailable"})
+    )
+
+    result = secmaster_stats(cfg)
+    parsed = json.loads(result)
+
+    assert "error" in parsed
+    assert route.call_count == api_module.MAX_RETRIES + 1
+    assert len(sleeps) == api_module.MAX_RETRIES
+    assert all(0 < d <= api_module.MAX_RETRY_DELAY for d in sleeps)
+
+
 def test_api_url_not_configured(cfg_no_url):
     """Empty API URL should return an error without making any request."""
     result = query_trades(cfg_no_url, "kalshi")
@@ -833,7 +1236,7 @@ def test_api_connection_error_returns_error(cfg):
     result = query_volume(cfg)
     parsed = json.loads(result)
 
-    assert "error" in parsed
+    assert parsed == {"error": "API request failed: connection error"}
 
 
 @respx.mock
@@ -846,7 +1249,7 @@ def test_api_timeout_returns_error(cfg):
     result = secmaster_stats(cfg)
     parsed = json.loads(result)
 
-    assert "error" in parsed
+    assert parsed == {"error": "API request failed: timeout"}
 
 
 # ---------------------------------------------------------------------------
@@ -870,6 +1273,40 @@ def test_auth_header_sent(cfg):
     assert request.headers["x-client-type"] == "mcp"
 
 
+@respx.mock
+def test_client_reused_across_calls(cfg):
+    """Consecutive API calls should share one pooled client."""
+    respx.get(f"{TEST_API_URL}/v1/data/feeds").mock(
+        return_value=httpx.Response(200, json={"feeds": []})
+    )
+    respx.get(f"{TEST_API_URL}/v1/secmaster/stats").mock(
+        return_value=httpx.Response(200, json={})
+    )
+
+    list_feeds(cfg)
+    client = api_module._get_client(cfg)
+    secmaster_stats(cfg)
+
+    assert api_module._get_client(cfg) is client
+    assert len(api_module._clients) == 1
+
+
+@pytest.mark.parametrize(
+    "no_proxy,proxied",
+    [("", True), ("test-api", False), ("*", False)],
+)
+def test_client_honors_proxy_env(cfg, monkeypatch, no_proxy, proxied):
+    """HTTP(S)_PROXY still applies with an explicit transport, unless NO_PROXY covers the host."""
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY"):
+        monkeypatch.delenv(var, raising=False)
+        monkeypatch.delenv(var.lower(), raising=False)
+    monkeypatch.setenv("HTTP_PROXY", "proxy.internal:3128")
+    monkeypatch.setenv("NO_PROXY", no_proxy)
+
+    assert api_module._proxy_urls(cfg) == ({"http://": "http://proxy.internal:3128"} if proxied else {})
+    assert bool(api_module._get_client(cfg)._mounts) is proxied
+
+
 @respx.mock
 def test_no_auth_header_when_no_key():
     """When api_key is empty, no Authorization header should be sent."""
@@ -883,3 +1320,107 @@ def test_no_auth_header_when_no_key():
     assert route.call_count == 1
     request = route.calls[0].request
     assert "authorization" not in request.headers
+
+
+def test_dumps_stringifies_non_str_keys():
+    """Non-str dict keys serialize like stdlib json instead of raising."""
+    assert json.loads(dumps({1: "a", "b": 2})) == {"1": "a", "b": 2}
+
+
+# ---------------------------------------------------------------------------
+# Server input validation
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("tool", server_module.TOOLS, ids=lambda t: t.name)
+def test_tool_schema_is_valid(tool):
+    """Every inputSchema is a valid schema with a compiled validator and exactly one handler."""
+    Draft202012Validator.check_schema(tool.inputSchema)
+    assert tool.name in server_module._VALIDATORS
+    assert (tool.name in server_module._TOOL_DISPATCH) != (tool.name in server_module._ASYNC_TOOL_DISPATCH)
+
+
+def test_validate_arguments_accepts_valid_call():
+    server_module._validate_arguments("query_trades", {"feed": "kalshi", "limit": 5})
+
+
+@pytest.mark.parametrize(
+    "name,arguments",
+    [
+        ("query_trades", {"feed": "nyse"}),
+        ("browse_tree", {}),
+    ],
+    ids=["bad_enum", "missing_required"],
+)
+def test_validate_arguments_rejects_invalid_call(name, arguments):
+    with pytest.raises(ValueError, match="^Input validation error: "):
+        server_module._validate_arguments(name, arguments)
+
+
+# ---------------------------------------------------------------------------
+# Server call coalescing
+# ---------------------------------------------------------------------------
+
+
+async def _call_tool(cfg, inflight, executor, name, arguments):
+    return await server_module._coalesced(
+        inflight,
+        server_module._call_key(name, arguments),
+        lambda: server_module._dispatch(cfg, name, arguments, executor, asyncio.Semaphore(4)),
+    )
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_identical_calls_share_one_request(cfg):
+    """Concurrent identical calls make one upstream GET; a cancelled caller doesn't affect the rest."""
+    release = threading.Event()
+
+    def slow_volume(request):
+        release.wait(5)
+        return httpx.Response(200, json={"volume": 1})
+
+    route = respx.get(f"{TEST_API_URL}/v1/data/volume").mock(side_effect=slow_volume)
+    inflight: dict = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        calls = [
+            asyncio.create_task(_call_tool(cfg, inflight, executor, "query_volume", {"feed": "kalshi"}))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        calls[0].cancel()
+        release.set()
+        result = await calls[1]
+
+    assert json.loads(result) == {"volume": 1}
+    assert calls[0].cancelled()
+    assert route.call_count == 1
+    assert inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_coalesced_failure_reaches_every_caller(cfg, monkeypatch):
+    calls = 0
+
+    def boom(cfg, arguments):
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(server_module._TOOL_DISPATCH, "list_feeds", boom)
+    inflight: dict = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = await asyncio.gather(
+            *(_call_tool(cfg, inflight, executor, "list_feeds", {}) for _ in range(2))
+        )
+
+    assert calls == 1
+    assert [json.loads(r) for r in results] == [{"error": "boom"}] * 2
+
+
+def test_call_key_skips_unserializable_arguments():
+    """Arguments orjson can't encode (e.g. >64-bit ints) are run without coalescing."""
+    assert server_module._call_key("query_trades", {"limit": 2**70}) is None
+    assert server_module._call_key("query_trades", {"b": 1, "a": 2}) == server_module._call_key(
+        "query_trades", {"a": 2, "b": 1}
+    )